@@ -2,67 +2,90 @@
 import json
 import sys
 import os
+import math
+from array import array
+from itertools import groupby
+from pathlib import Path
+
+def assign_windows(starts, ends, segment_duration, window_count, total_duration):
+    """Return the fixed window index for each segment midpoint (-1 if outside)"""
+    window_indices = []
+    for start, end in zip(starts, ends):
+        midpoint = (start + end) * 0.5
+        # The last window ends at total_duration, so later midpoints fall
+        # outside every window even when that window is shorter than the rest
+        if midpoint < 0 or midpoint >= total_duration:
+            window_indices.append(-1)
+            continue
+        # Midpoints are non-negative here, so int() truncation equals floor
+        # and a true division is enough (float // also computes fmod)
+        window = int(midpoint / segment_duration)
+        window_indices.append(window if window < window_count else -1)
+    return window_indices
 
 def create_fixed_segments(json_file, segment_duration=5.0):
     """Create fixed-duration segments from Whisper JSON output"""
     
-    # Read the JSON file
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    # Read the JSON file, keeping only the segment list so the rest of the
+    # Whisper document (full text, language, etc.) can be freed right away
+    with open(json_file, 'rb') as f:
+        segments = json.loads(f.read())['segments']
     
-    segments = data['segments']
     fixed_segments = []
     
     # Get total duration from last segment
     total_duration = segments[-1]['end'] if segments else 0
     
-    # Create fixed duration segments
-    current_time = 0
-    segment_id = 1
+    # Pull the columns out once (timings as dense float arrays, text stripped
+    # here at ingest) and compute every segment's window index from its midpoint
+    starts = array('d', [seg['start'] for seg in segments])
+    ends = array('d', [seg['end'] for seg in segments])
+    texts = [seg['text'].strip() for seg in segments]
+    window_count = math.ceil(total_duration / segment_duration)
+    if window_count and (window_count - 1) * segment_duration >= total_duration:
+        # The division rounded up past a whole number of windows
+        window_count -= 1
+    window_indices = assign_windows(starts, ends, segment_duration, window_count, total_duration)
+
+    # Group segments by window instead of rescanning every segment for every
+    # window. The stable sort keeps transcript order within a window (and is
+    # linear on Whisper's already-ordered output), and each group is joined
+    # straight from its iterator
+    in_range = (i for i, window in enumerate(window_indices) if window >= 0)
+    order = sorted(in_range, key=window_indices.__getitem__)
+    window_texts = [''] * window_count
+    for window, group in groupby(order, key=window_indices.__getitem__):
+        window_texts[window] = ' '.join(texts[i] for i in group)
     
-    while current_time < total_duration:
-        segment_end = min(current_time + segment_duration, total_duration)
-        segment_text = []
-        
-        # Find all text that falls within this time window
-        for seg in segments:
-            # Check if segment's midpoint falls within our window
-            seg_midpoint = (seg['start'] + seg['end']) / 2
-            if current_time <= seg_midpoint < segment_end:
-                segment_text.append(seg['text'].strip())
-        
-        # Combine text for this time window
-        combined_text = ' '.join(segment_text)
-        
+    # Create fixed duration segments, taking each window's bounds from its
+    # index so rounding error doesn't accumulate across windows
+    for window, combined_text in enumerate(window_texts):
         fixed_segments.append({
-            'id': segment_id,
-            'start': current_time,
-            'end': segment_end,
+            'id': window + 1,
+            'start': window * segment_duration if window else 0,
+            'end': min((window + 1) * segment_duration, total_duration),
             'text': combined_text
         })
-        
-        current_time = segment_end
-        segment_id += 1
     
     return fixed_segments
 
+def format_srt_timestamp(seconds):
+    """Format seconds as an SRT timestamp (HH:MM:SS.mmm)"""
+    hours, remainder = divmod(seconds, 3600)
+    mins, secs = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(mins):02d}:{secs:06.3f}"
+
 def save_as_srt(segments, output_file):
     """Save segments as SRT file"""
-    with open(output_file, 'w') as f:
-        for seg in segments:
-            # Convert seconds to SRT timestamp format
-            start_hours = int(seg['start'] // 3600)
-            start_mins = int((seg['start'] % 3600) // 60)
-            start_secs = seg['start'] % 60
-            
-            end_hours = int(seg['end'] // 3600)
-            end_mins = int((seg['end'] % 3600) // 60)
-            end_secs = seg['end'] % 60
-            
-            f.write(f"{seg['id']}\n")
-            f.write(f"{start_hours:02d}:{start_mins:02d}:{start_secs:06.3f} --> "
-                   f"{end_hours:02d}:{end_mins:02d}:{end_secs:06.3f}\n")
-            f.write(f"{seg['text']}\n\n")
+    # Build the whole file in memory and write it once as UTF-8 bytes
+    entries = [
+        f"{seg['id']}\n"
+        f"{format_srt_timestamp(seg['start'])} --> {format_srt_timestamp(seg['end'])}\n"
+        f"{seg['text']}\n\n"
+        for seg in segments
+    ]
+    with open(output_file, 'wb') as f:
+        f.write(''.join(entries).encode('utf-8'))
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -75,13 +98,15 @@ if __name__ == "__main__":
     # Create fixed segments
     fixed_segments = create_fixed_segments(json_file, segment_duration)
     
-    # Save as new JSON
-    output_json = json_file.replace('.json', '_fixed_segments.json')
-    with open(output_json, 'w') as f:
-        json.dump({'segments': fixed_segments}, f, indent=2)
+    # Save as new JSON (compact, so the C encoder handles it in one shot)
+    input_path = Path(json_file)
+    output_json = input_path.with_name(input_path.stem + '_fixed_segments.json')
+    with open(output_json, 'wb') as f:
+        f.write(json.dumps({'segments': fixed_segments}, separators=(',', ':')).encode('utf-8'))
+        f.write(b'\n')
     
     # Save as SRT
-    output_srt = json_file.replace('.json', '_fixed_segments.srt')
+    output_srt = input_path.with_name(input_path.stem + '_fixed_segments.srt')
     save_as_srt(fixed_segments, output_srt)
     
     print(f"Created {len(fixed_segments)} fixed segments of {segment_duration} seconds")
@@ -3,6 +3,7 @@ Step definitions for Task 13: Anthropic API Pitch Analysis Integration (POC)
 Tests COMPLETE UI implementation including visual elements, interactions, and timing
 """
 
+import re
 import time
 import pytest
 from selenium.webdriver.common.by import By
@@ -10,57 +11,197 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from behave import given, when, then
 import json
 
 
+# Patterns and expected values shared across steps
+_COST_RE = re.compile(r'\$(\d+\.\d+)')
+_EXPECTED_CATEGORIES = frozenset({
+    "Speech Mechanics", "Content Quality", "Visual Presentation", "Overall Effectiveness"
+})
+
+
+# WebDriverWait instances keyed by (driver, timeout, poll frequency)
+_WAIT_CACHE = {}
+
+# In-page equivalent of WebElement.is_displayed(): laid out, not hidden via
+# visibility, and neither the element nor an ancestor fully transparent
+_IS_DISPLAYED_JS = """
+    const isDisplayed = el => {
+        if (el.getClientRects().length === 0) return false;
+        if (['hidden', 'collapse'].includes(window.getComputedStyle(el).visibility)) return false;
+        for (let node = el; node; node = node.parentElement) {
+            if (window.getComputedStyle(node).opacity === '0') return false;
+        }
+        return true;
+    };
+"""
+
+
 # Helper functions for UI testing
+def get_wait(timeout=10, poll=0.2):
+    """Return a shared WebDriverWait for this driver and timeout"""
+    key = (context.driver, timeout, poll)
+    if key not in _WAIT_CACHE:
+        _WAIT_CACHE[key] = WebDriverWait(
+            context.driver, timeout, poll_frequency=poll,
+            ignored_exceptions=(StaleElementReferenceException,)
+        )
+    return _WAIT_CACHE[key]
+
 def wait_for_element(selector, timeout=10):
     """Wait for element to be present and visible"""
-    return WebDriverWait(context.driver, timeout).until(
+    # Usually an earlier step already rendered it: take it in one round trip
+    element = context.driver.execute_script(_IS_DISPLAYED_JS + """
+        const el = document.querySelector(arguments[0]);
+        return el && isDisplayed(el) ? el : null;
+    """, selector)
+    if element is not None:
+        return element
+    return get_wait(timeout).until(
         EC.visibility_of_element_located((By.CSS_SELECTOR, selector))
     )
 
 def wait_for_elements(selector, timeout=10):
     """Wait for multiple elements to be present"""
-    return WebDriverWait(context.driver, timeout).until(
+    return get_wait(timeout).until(
         EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
     )
 
+# Computed style properties the steps assert on, fetched by CSS name
+_STYLE_PROPERTIES = [
+    'display', 'grid-template-columns', 'border-color', 'border-radius',
+    'background-color', 'font-size', 'transition-property', 'width', 'opacity'
+]
+
 def get_computed_style(element, property_name=None):
-    """Get computed CSS styles for an element"""
-    if property_name:
-        return context.driver.execute_script(
-            f"return window.getComputedStyle(arguments[0]).{property_name}", element
-        )
+    """Get computed CSS styles for an element (only the properties the steps use)"""
+    styles = context.driver.execute_script("""
+        const cs = window.getComputedStyle(arguments[0]);
+        return Object.fromEntries(arguments[1].map(name => [name, cs.getPropertyValue(name)]));
+    """, element, [property_name] if property_name else _STYLE_PROPERTIES)
+    return styles[property_name] if property_name else styles
+
+def fetch_section_snapshot(selector, child_selector=None):
+    """Read an element's text, classes, key computed styles and child texts in one round trip"""
+    return context.driver.execute_script("""
+        const el = document.querySelector(arguments[0]);
+        const cs = window.getComputedStyle(el);
+        const children = arguments[1] ? Array.from(el.querySelectorAll(arguments[1])) : [];
+        return {
+            text: el.innerText.trim(),
+            className: el.className,
+            styles: Object.fromEntries(arguments[2].map(name => [name, cs.getPropertyValue(name)])),
+            childTexts: children.map(child => child.innerText.trim())
+        };
+    """, selector, child_selector, _STYLE_PROPERTIES)
+
+def fetch_issues():
+    """Read every issue item's text and first timestamp reference in one round trip"""
+    wait_for_elements('[data-testid^="issue-item-"]')
+    return context.driver.execute_script("""
+        return Array.from(document.querySelectorAll('[data-testid^="issue-item-"]'), issue => {
+            const timestamp = issue.querySelector('[data-testid^="issue-timestamp-"]');
+            return {text: issue.innerText.trim(), timestamp: timestamp && timestamp.innerText.trim()};
+        });
+    """)
+
+def count_elements(selector):
+    """Count elements matching selector without transferring them"""
+    return context.driver.execute_script("return document.querySelectorAll(arguments[0]).length", selector)
+
+def fetch_texts(selector):
+    """Read the text of every element matching selector in one round trip"""
     return context.driver.execute_script(
-        "return window.getComputedStyle(arguments[0])", element
+        "return Array.from(document.querySelectorAll(arguments[0]), el => el.innerText.trim())", selector
     )
 
+def count_active_buttons(pattern):
+    """Count enabled, displayed buttons whose visible text matches a JS regex pattern, filtered in the browser"""
+    return context.driver.execute_script(_IS_DISPLAYED_JS + """
+        const pattern = new RegExp(arguments[0]);
+        return Array.from(document.querySelectorAll('button')).filter(button =>
+            !button.disabled && isDisplayed(button) && pattern.test(button.innerText)
+        ).length;
+    """, pattern)
+
+def wait_until(predicate, timeout=10, poll=0.1):
+    """Wait until predicate(driver) is truthy, polling at a short interval"""
+    return get_wait(timeout, poll).until(predicate)
+
+def wait_for_text(selector, *fragments, timeout=10):
+    """Wait until an element's text contains every fragment"""
+    # Look the element up on every poll and check all fragments against the
+    # same text; the wait ignores missing and re-rendered (stale) elements
+    def contains_all(driver):
+        text = driver.find_element(By.CSS_SELECTOR, selector).text
+        return all(fragment in text for fragment in fragments)
+    
+    return get_wait(timeout, 0.1).until(contains_all)
+
+def start_progress_log():
+    """Record every distinct analysis progress text in the page, so brief stages aren't missed between polls"""
+    context.driver.execute_script("""
+        if (window.__progressObserver) return;
+        window.__progressLog = [];
+        const record = () => {
+            const el = document.querySelector('[data-testid="analysis-progress-text"]');
+            const log = window.__progressLog;
+            if (el && log[log.length - 1] !== el.innerText) log.push(el.innerText);
+        };
+        record();
+        window.__progressObserver = new MutationObserver(record);
+        window.__progressObserver.observe(document.body, {childList: true, subtree: true, characterData: true});
+    """)
+
+def wait_for_progress(*fragments, timeout=10):
+    """Wait until a recorded (or the current) progress text contains every fragment"""
+    return wait_until(lambda d: d.execute_script("""
+        const el = document.querySelector('[data-testid="analysis-progress-text"]');
+        const texts = (window.__progressLog || []).concat(el ? [el.innerText] : []);
+        return texts.some(text => arguments[0].every(fragment => text.includes(fragment)));
+    """, list(fragments)), timeout)
+
 def wait_for_element_to_disappear(selector, timeout=5):
     """Wait for element to disappear from DOM"""
+    # Watch the locator rather than one element, so a re-render (which leaves
+    # a stale reference behind) doesn't count as the element disappearing
     try:
-        WebDriverWait(context.driver, timeout).until(
-            EC.invisibility_of_element_located((By.CSS_SELECTOR, selector))
-        )
+        get_wait(timeout).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, selector)))
         return True
     except TimeoutException:
         return False
 
 def measure_timing(func, max_time=None):
     """Measure execution time of a function"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     result = func()
-    elapsed = time.time() - start_time
+    elapsed = time.perf_counter() - start_time
     if max_time:
         assert elapsed <= max_time, f"Operation took {elapsed:.3f}s, expected <= {max_time}s"
     return result, elapsed
 
 
+def set_state(**state):
+    """Apply experiment state updates in a single round trip"""
+    context.driver.execute_script("window.updateExperimentState(arguments[0])", state)
+
+def block_analysis_requests(blocked=True):
+    """Fail (or stop failing) the browser's pitch analysis API calls at the network level"""
+    context.driver.execute_cdp_cmd('Network.enable', {})
+    context.driver.execute_cdp_cmd('Network.setBlockedURLs', {
+        'urls': ['*/api/experiment/analyze-pitch*'] if blocked else []
+    })
+
+
 # Background state verification
 @given('the user is viewing the Architecture Experiment page')
 def user_viewing_architecture_page():
+    # Load the page fresh: resetting state in place would leave the previous
+    # scenario's timers, fetches and component state running
+    block_analysis_requests(False)
     context.driver.get("http://localhost:3000/experiment/architecture-test")
     page_title = wait_for_element('h1')
     assert page_title.text == "Architecture Experiment"
@@ -69,8 +210,8 @@ def user_viewing_architecture_page():
 def frame_extraction_completed():
     # Verify 3x3 grid exists and has 9 frames
     frame_grid = wait_for_element('[data-testid="frame-grid"]')
-    frames = frame_grid.find_elements(By.CSS_SELECTOR, '[data-testid^="frame-container-"]')
-    assert len(frames) == 9, f"Expected 9 frames, found {len(frames)}"
+    frame_count = count_elements('[data-testid="frame-grid"] [data-testid^="frame-container-"]')
+    assert frame_count == 9, f"Expected 9 frames, found {frame_count}"
     
     # Verify grid layout
     grid_styles = get_computed_style(frame_grid)
@@ -85,18 +226,13 @@ def transcription_completed():
     assert len(full_transcript.text.strip()) > 0
     
     # Verify segmented transcript has segments
-    segmented_transcript = wait_for_element('[data-testid="segmented-transcript-area"]')
-    segments = segmented_transcript.find_elements(By.CSS_SELECTOR, '[data-testid^="segment-"]')
-    assert len(segments) > 0, "No transcript segments found"
+    wait_for_element('[data-testid="segmented-transcript-area"]')
+    assert count_elements('[data-testid="segmented-transcript-area"] [data-testid^="segment-"]') > 0, "No transcript segments found"
 
 @given('the Processing Status section shows "Processing complete!" with green celebration emoji')
 def processing_status_complete():
-    # Verify processing complete status
-    complete_status = wait_for_element('[data-testid="processing-complete-status"]')
-    assert complete_status.is_displayed()
-    
-    # Verify celebration emoji is present and animating
-    celebration_emoji = complete_status.find_element(By.CSS_SELECTOR, '[data-testid="celebration-animation"]')
+    # Verify processing complete status with its celebration emoji in one lookup
+    celebration_emoji = wait_for_element('[data-testid="processing-complete-status"] [data-testid="celebration-animation"]')
     assert celebration_emoji.text == "🎉"
     
     # Verify animation class
@@ -108,20 +244,20 @@ def processing_status_complete():
 @when('the system detects both frames and segmented transcript are available')
 def system_detects_prerequisites():
     # This is triggered automatically in the system
-    # We simulate by ensuring both conditions are met
-    time.sleep(0.6)  # Allow time for automatic detection
+    # Detection is complete once the Pitch Analysis section is rendered
+    wait_until(lambda d: count_elements('[data-testid="pitch-analysis-section"]'), timeout=5)
 
 @then('the grid layout automatically expands to show a 5th section below the existing 4 sections')
 def grid_layout_expands():
-    # Wait for 5th section to appear
+    # Wait for 5th section to appear, keeping the last lookup for the assertion
+    sections = []
     def check_sections():
-        sections = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid$="-section"], .rounded-lg.p-4.border-2')
+        sections[:] = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid$="-section"], .rounded-lg.p-4.border-2')
         return len(sections) >= 5
     
-    WebDriverWait(context.driver, 5).until(lambda d: check_sections())
+    get_wait(5).until(lambda d: check_sections())
     
     # Verify layout expansion
-    sections = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid$="-section"], .rounded-lg.p-4.border-2')
     assert len(sections) == 5, f"Expected 5 sections, found {len(sections)}"
 
 @then('the new "Pitch Analysis" section appears with an indigo-500 border and "Pitch Analysis" title')
@@ -129,15 +265,16 @@ def pitch_analysis_section_appears():
     # Wait for pitch analysis section
     pitch_section = wait_for_element('[data-testid="pitch-analysis-section"]')
     assert pitch_section.is_displayed()
+    snapshot = fetch_section_snapshot('[data-testid="pitch-analysis-section"]', '[data-testid="pitch-analysis-title"]')
     
     # Verify border color (indigo-500)
-    border_color = get_computed_style(pitch_section, 'border-color')
+    border_color = snapshot['styles']['border-color']
     # Indigo-500 is roughly rgb(99, 102, 241)
     assert 'rgb(99, 102, 241)' in border_color or '#6366f1' in border_color.lower()
     
     # Verify title
-    title = pitch_section.find_element(By.CSS_SELECTOR, '[data-testid="pitch-analysis-title"]')
-    assert title.text == "Pitch Analysis"
+    titles = snapshot['childTexts']
+    assert titles and titles[0] == "Pitch Analysis"
 
 @then('a progress indicator immediately shows "Preparing multimodal data... 0%"')
 def progress_indicator_shows():
@@ -147,72 +284,48 @@ def progress_indicator_shows():
 
 @then('the status updates to "Aligning frames with transcript segments..."')
 def status_updates_alignment():
-    time.sleep(0.1)  # Brief pause for status update
-    status = wait_for_element('[data-testid="analysis-status-text"]')
-    assert "Aligning frames with transcript segments" in status.text
+    wait_for_element('[data-testid="analysis-status-text"]')
+    wait_for_text('[data-testid="analysis-status-text"]', "Aligning frames with transcript segments", timeout=5)
 
 @then('no user interaction is required to trigger this analysis')
 def no_user_interaction_required():
     # Verify no buttons or clickable elements needed
     # This is validated by the fact that the analysis started automatically
     # We can check that no "Start Analysis" or similar buttons exist
-    start_buttons = context.driver.find_elements(By.XPATH, "//button[contains(text(), 'Start') or contains(text(), 'Analyze') or contains(text(), 'Begin')]")
-    # Filter out any buttons that might be disabled or in other sections
-    active_start_buttons = [btn for btn in start_buttons if btn.is_enabled() and btn.is_displayed()]
-    assert len(active_start_buttons) == 0, "Found unexpected interactive trigger buttons"
+    # (disabled or hidden buttons are filtered out in the browser)
+    active_start_buttons = count_active_buttons('Start|Analyze|Begin')
+    assert active_start_buttons == 0, "Found unexpected interactive trigger buttons"
 
 
 # Progress updates
 @when('the analysis progresses automatically')
 def analysis_progresses():
+    # Start recording progress stages before they can be missed
+    start_progress_log()
+    
     # Wait for progress to advance beyond initial state
-    time.sleep(1)
+    def progressed(driver):
+        progress_texts = driver.find_elements(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
+        return not progress_texts or "Preparing multimodal data" not in progress_texts[0].text
+    
+    wait_until(progressed, timeout=5)
 
 @then('the progress bar updates through: "Sending to Claude 4 Opus... 25%"')
 def progress_updates_claude():
     # Wait for this specific progress state (or verify it occurred)
-    def check_progress():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "Claude 4 Opus" in progress_text.text and "25%" in progress_text.text
-        except:
-            return False
-    
-    # May need to wait or check if this state was reached
-    WebDriverWait(context.driver, 10).until(lambda d: check_progress())
+    wait_for_progress("Claude 4 Opus", "25%")
 
 @then('then "Analyzing visual-verbal alignment... 50%"')
 def progress_updates_analysis():
-    def check_progress():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "visual-verbal alignment" in progress_text.text and "50%" in progress_text.text
-        except:
-            return False
-    
-    WebDriverWait(context.driver, 10).until(lambda d: check_progress())
+    wait_for_progress("visual-verbal alignment", "50%")
 
 @then('then "Processing framework scores... 75%"')
 def progress_updates_framework():
-    def check_progress():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "framework scores" in progress_text.text and "75%" in progress_text.text
-        except:
-            return False
-    
-    WebDriverWait(context.driver, 10).until(lambda d: check_progress())
+    wait_for_progress("framework scores", "75%")
 
 @then('finally "Generating recommendations... 100%"')
 def progress_updates_recommendations():
-    def check_progress():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "recommendations" in progress_text.text and "100%" in progress_text.text
-        except:
-            return False
-    
-    WebDriverWait(context.driver, 10).until(lambda d: check_progress())
+    wait_for_progress("recommendations", "100%")
 
 @then('the analysis completes successfully')
 def analysis_completes():
@@ -270,104 +383,115 @@ def results_render():
 
 @then('the section displays a clean card layout with:')
 def section_displays_clean_layout():
-    results_card = wait_for_element('[data-testid="analysis-results-card"]')
+    wait_for_element('[data-testid="analysis-results-card"]')
     
     # Verify card styling
-    card_styles = get_computed_style(results_card)
+    card_styles = fetch_section_snapshot('[data-testid="analysis-results-card"]')['styles']
     assert 'border-radius' in card_styles and card_styles['border-radius'] != '0px'
     assert card_styles['background-color'] != 'rgba(0, 0, 0, 0)'  # Has background
 
 @then('an "Overall Score" section at the top showing a large score (e.g., "7.2/10") in readable text')
 def overall_score_section():
-    score_section = wait_for_element('[data-testid="overall-score-section"]')
-    score_display = score_section.find_element(By.CSS_SELECTOR, '[data-testid="overall-score-display"]')
+    score_display_selector = '[data-testid="overall-score-section"] [data-testid="overall-score-display"]'
+    wait_for_element(score_display_selector)
+    snapshot = fetch_section_snapshot(score_display_selector)
     
     # Verify score format
-    score_text = score_display.text
+    score_text = snapshot['text']
     assert "/10" in score_text, f"Score format incorrect: {score_text}"
     
     # Verify large text styling
-    font_size = get_computed_style(score_display, 'font-size')
+    font_size = snapshot['styles']['font-size']
     font_size_value = float(font_size.replace('px', ''))
     assert font_size_value >= 24, f"Score text too small: {font_size}"
 
 @then('four category score rows:')
 def four_category_score_rows():
-    category_scores = wait_for_elements('[data-testid^="category-score-"]')
-    assert len(category_scores) == 4, f"Expected 4 category scores, found {len(category_scores)}"
+    wait_for_elements('[data-testid^="category-score-"]')
+    category_texts = fetch_texts('[data-testid^="category-score-"]')
+    assert len(category_texts) == 4, f"Expected 4 category scores, found {len(category_texts)}"
     
     # Verify expected categories
-    expected_categories = ["Speech Mechanics", "Content Quality", "Visual Presentation", "Overall Effectiveness"]
-    found_categories = []
-    
-    for score_element in category_scores:
-        category_text = score_element.text
-        for expected in expected_categories:
-            if expected in category_text:
-                found_categories.append(expected)
-                break
-    
-    assert len(found_categories) == 4, f"Missing categories: {set(expected_categories) - set(found_categories)}"
+    found_categories = {
+        expected for category_text in category_texts
+        for expected in _EXPECTED_CATEGORIES if expected in category_text
+    }
+    missing_categories = _EXPECTED_CATEGORIES - found_categories
+    assert not missing_categories, f"Missing categories: {missing_categories}"
 
 @then('below that, a "Key Issues Found" section with a numbered list:')
 def key_issues_section():
-    issues_section = wait_for_element('[data-testid="key-issues-section"]')
-    issues_list = issues_section.find_elements(By.CSS_SELECTOR, '[data-testid^="issue-item-"]')
+    wait_for_element('[data-testid="key-issues-section"]')
+    issue_texts = fetch_texts('[data-testid="key-issues-section"] [data-testid^="issue-item-"]')
     
     # Verify list format
-    assert len(issues_list) >= 1, "No issues found in list"
+    assert len(issue_texts) >= 1, "No issues found in list"
     
     # Verify numbering
-    for i, issue in enumerate(issues_list[:3], 1):
-        issue_text = issue.text
+    for i, issue_text in enumerate(issue_texts[:3], 1):
         assert f"{i}." in issue_text, f"Issue {i} not properly numbered: {issue_text}"
 
 @then('each issue shows:')
 def each_issue_shows_details():
-    issues = wait_for_elements('[data-testid^="issue-item-"]')
+    wait_for_elements('[data-testid^="issue-item-"]')
+    
+    # Check every issue's parts in one round trip
+    issues = context.driver.execute_script("""
+        return Array.from(document.querySelectorAll('[data-testid^="issue-item-"]'), issue => ({
+            hasTimestamp: !!issue.querySelector('[data-testid^="issue-timestamp-"]'),
+            hasDescription: !!issue.querySelector('[data-testid^="issue-description-"]'),
+            hasRecommendation: !!issue.querySelector('[data-testid^="issue-recommendation-"]')
+        }));
+    """)
     
     for issue in issues:
         # Verify timestamp reference
-        timestamp_elements = issue.find_elements(By.CSS_SELECTOR, '[data-testid^="issue-timestamp-"]')
-        assert len(timestamp_elements) > 0, "Issue missing timestamp reference"
+        assert issue['hasTimestamp'], "Issue missing timestamp reference"
         
         # Verify issue description
-        description_elements = issue.find_elements(By.CSS_SELECTOR, '[data-testid^="issue-description-"]')
-        assert len(description_elements) > 0, "Issue missing description"
+        assert issue['hasDescription'], "Issue missing description"
         
         # Verify recommendation
-        recommendation_elements = issue.find_elements(By.CSS_SELECTOR, '[data-testid^="issue-recommendation-"]')
-        assert len(recommendation_elements) > 0, "Issue missing recommendation"
+        assert issue['hasRecommendation'], "Issue missing recommendation"
 
 
 # Scenario 3: Analysis Error States and Auto-Retry
 @given('the automatic analysis process starts after transcription completion')
 def analysis_process_starts():
+    # Block the analysis endpoint while the analysis is still preparing: the
+    # request goes out in the same tick as the 25% stage, and blocking an
+    # in-flight request has no effect
+    start_progress_log()
+    block_analysis_requests()
+    stage = context.driver.execute_script(
+        "return window.experimentState && window.experimentState.pitchAnalysisStage"
+    )
+    assert stage in (None, 'preparing'), f"Analysis request already sent (stage: {stage})"
+    
     # Verify analysis is in progress
     wait_for_element('[data-testid="analysis-progress-bar"]')
 
 @given('the progress bar shows "Sending to Claude 4 Opus... 25%"')
 def progress_shows_claude_25():
-    progress_text = wait_for_element('[data-testid="analysis-progress-text"]')
-    assert "Claude 4 Opus" in progress_text.text
-    assert "25%" in progress_text.text
+    # The request fails fast once sent, so check the recorded stages
+    wait_for_progress("Claude 4 Opus", "25%")
 
 @when('the API request fails due to network timeout')
 def api_request_fails():
-    # Simulate network failure (this would be mocked in real implementation)
-    context.driver.execute_script("""
-        window.dispatchEvent(new CustomEvent('simulateAnalysisError', {
-            detail: { type: 'network_timeout' }
-        }));
-    """)
+    # The endpoint was blocked before the request went out; wait for the page
+    # to register the failure
+    wait_until(lambda d: d.execute_script(
+        "return !!(window.experimentState && window.experimentState.pitchAnalysisError)"
+    ), timeout=5)
 
 @then('the progress bar changes to red color')
 def progress_bar_changes_red():
-    progress_bar = wait_for_element('[data-testid="analysis-progress-bar"]')
+    wait_for_element('[data-testid="analysis-progress-bar"]')
     
     # Check for red color or error class
-    bar_classes = progress_bar.get_attribute('class')
-    bar_color = get_computed_style(progress_bar, 'background-color')
+    bar = fetch_section_snapshot('[data-testid="analysis-progress-bar"]')
+    bar_classes = bar['className']
+    bar_color = bar['styles']['background-color']
     
     assert 'error' in bar_classes or 'red' in bar_classes or 'rgb(220, 38, 38)' in bar_color
 
@@ -380,25 +504,29 @@ def error_message_appears():
 
 @then('a countdown timer shows "Retry in 3... 2... 1..."')
 def countdown_timer_shows():
-    countdown = wait_for_element('[data-testid="retry-countdown"]')
+    wait_for_element('[data-testid="retry-countdown"]')
     
     # Wait to see countdown in action
-    time.sleep(1)
-    countdown_text = countdown.text
-    assert "Retry in" in countdown_text
+    wait_for_text('[data-testid="retry-countdown"]', "Retry in", timeout=5)
 
 @then('the system automatically attempts the analysis again')
 def system_retries_automatically():
-    # Wait for retry attempt (progress should reset)
-    time.sleep(4)  # Wait for countdown
+    # Wait for retry attempt once the countdown finishes (progress should reset)
+    wait_for_element('[data-testid="analysis-progress-text"]', timeout=5)
+    progress_locator = (By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
     
-    # Verify retry has started
-    progress_text = wait_for_element('[data-testid="analysis-progress-text"]')
-    # Should be back to initial state or early progress
-    assert "0%" in progress_text.text or "Preparing" in progress_text.text
+    # Should be back to initial state or early progress (looked up by locator
+    # on every poll, so a re-render can't leave the wait on a stale element)
+    wait_until(EC.any_of(
+        EC.text_to_be_present_in_element(progress_locator, "0%"),
+        EC.text_to_be_present_in_element(progress_locator, "Preparing")
+    ), timeout=5)
 
 @when('the automatic retry succeeds')
 def automatic_retry_succeeds():
+    # Let the retry through
+    block_analysis_requests(False)
+    
     # Wait for retry to complete successfully
     wait_for_element('[data-testid="analysis-complete-message"]', timeout=15)
 
@@ -410,11 +538,10 @@ def error_message_clears():
 
 @then('the progress bar returns to blue color')
 def progress_bar_returns_blue():
-    progress_bar = wait_for_element('[data-testid="analysis-progress-bar"]')
+    wait_for_element('[data-testid="analysis-progress-bar"]')
     
     # Check for normal color (not red/error)
-    bar_classes = progress_bar.get_attribute('class')
-    bar_color = get_computed_style(progress_bar, 'background-color')
+    bar_classes = fetch_section_snapshot('[data-testid="analysis-progress-bar"]')['className']
     
     assert 'error' not in bar_classes and 'red' not in bar_classes
 
@@ -427,12 +554,8 @@ def analysis_completes_normally():
 
 @when('the automatic retry also fails')
 def automatic_retry_also_fails():
-    # Simulate second failure
-    context.driver.execute_script("""
-        window.dispatchEvent(new CustomEvent('simulateAnalysisError', {
-            detail: { type: 'retry_failed' }
-        }));
-    """)
+    # The analysis endpoint is still blocked, so the retry fails too
+    block_analysis_requests()
 
 @then('an error message shows: "⚠ Analysis unavailable - Please refresh page to try again"')
 def final_error_message_shows():
@@ -446,15 +569,14 @@ def section_shows_error_state():
     assert pitch_section.is_displayed()
     
     # Verify error state styling
-    section_classes = pitch_section.get_attribute('class')
+    section_classes = fetch_section_snapshot('[data-testid="pitch-analysis-section"]')['className']
     assert 'error' in section_classes or 'failed' in section_classes
 
 @then('no manual retry button is needed (refresh page to restart entire flow)')
 def no_manual_retry_button():
     # Verify no retry buttons exist
-    retry_buttons = context.driver.find_elements(By.XPATH, "//button[contains(text(), 'Retry') or contains(text(), 'Try Again')]")
-    manual_retry_buttons = [btn for btn in retry_buttons if btn.is_displayed() and btn.is_enabled()]
-    assert len(manual_retry_buttons) == 0, "Found unexpected manual retry buttons"
+    manual_retry_buttons = count_active_buttons('Retry|Try Again')
+    assert manual_retry_buttons == 0, "Found unexpected manual retry buttons"
 
 
 # Scenario 4: Loading States During Automatic Analysis
@@ -475,11 +597,12 @@ def pitch_section_first_appears():
 
 @then('it slides down into view with a smooth expand animation')
 def slides_down_with_animation():
-    pitch_section = wait_for_element('[data-testid="pitch-analysis-section"]')
+    wait_for_element('[data-testid="pitch-analysis-section"]')
     
     # Check for animation classes or CSS transitions
-    section_classes = pitch_section.get_attribute('class')
-    transition_property = get_computed_style(pitch_section, 'transition-property')
+    section = fetch_section_snapshot('[data-testid="pitch-analysis-section"]')
+    section_classes = section['className']
+    transition_property = section['styles']['transition-property']
     
     assert 'animate' in section_classes or transition_property != 'none'
 
@@ -499,14 +622,7 @@ def placeholder_text_shows():
 
 @when('the progress updates to "Analyzing visual-verbal alignment"')
 def progress_updates_to_alignment():
-    def check_alignment_text():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "visual-verbal alignment" in progress_text.text
-        except:
-            return False
-    
-    WebDriverWait(context.driver, 10).until(lambda d: check_alignment_text())
+    wait_for_text('[data-testid="analysis-progress-text"]', "visual-verbal alignment")
 
 @then('the status text updates accordingly')
 def status_text_updates():
@@ -534,11 +650,12 @@ def placeholder_replaced_with_results():
 
 @then('scores and recommendations appear with a fade-in animation')
 def scores_appear_with_animation():
-    scores_section = wait_for_element('[data-testid="analysis-scores"]')
+    wait_for_element('[data-testid="analysis-scores"]')
     
     # Check for fade-in animation classes
-    score_classes = scores_section.get_attribute('class')
-    opacity = get_computed_style(scores_section, 'opacity')
+    scores_section = fetch_section_snapshot('[data-testid="analysis-scores"]')
+    score_classes = scores_section['className']
+    opacity = scores_section['styles']['opacity']
     
     assert 'fade-in' in score_classes or float(opacity) > 0.8
 
@@ -560,17 +677,12 @@ def analysis_completes_auto():
 
 @then('the cost breakdown automatically updates to show a new line item:')
 def cost_breakdown_updates():
-    # Click cost tracker to expand breakdown
-    cost_tracker = wait_for_element('[data-testid="cost-tracker"]')
-    cost_tracker.click()
-    
-    # Wait for breakdown to appear
-    cost_breakdown = wait_for_element('[data-testid="cost-breakdown"]')
-    assert cost_breakdown.is_displayed()
-    
-    # Look for Anthropic Claude line item
-    anthropic_cost = cost_breakdown.find_elements(By.XPATH, ".//*[contains(text(), 'Anthropic Claude')]")
-    assert len(anthropic_cost) > 0, "Anthropic Claude cost not found in breakdown"
+    # Read the Anthropic Claude line item straight from the exposed cost state,
+    # so the breakdown doesn't need to be expanded and searched
+    anthropic_cost = context.driver.execute_script(
+        "return window.experimentState && window.experimentState.costs.anthropicClaude"
+    )
+    assert anthropic_cost, "Anthropic Claude cost not found in breakdown"
 
 @then('the total cost updates to include this amount immediately')
 def total_cost_updates():
@@ -578,8 +690,7 @@ def total_cost_updates():
     total_text = cost_tracker.text
     
     # Verify total includes decimal amount (cost > $0.00)
-    import re
-    cost_match = re.search(r'\$(\d+\.\d+)', total_text)
+    cost_match = _COST_RE.search(total_text)
     assert cost_match, f"No valid cost found in: {total_text}"
     
     total_cost = float(cost_match.group(1))
@@ -593,9 +704,12 @@ def cost_tracker_shows_new_total():
 
 @then('clicking the cost tracker reveals the updated breakdown')
 def clicking_reveals_breakdown():
-    # Cost tracker should already be clicked from previous step
+    cost_tracker = wait_for_element('[data-testid="cost-tracker"]')
+    cost_tracker.click()
+    
     cost_breakdown = wait_for_element('[data-testid="cost-breakdown"]')
     assert cost_breakdown.is_displayed()
+    assert "Anthropic Claude" in cost_breakdown.text, "Anthropic Claude cost not found in breakdown"
 
 
 # Scenario 6: Analysis Readiness State Management
@@ -619,64 +733,52 @@ def processing_begins_parallel():
 @when('only frame extraction is complete')
 def only_frame_extraction_complete():
     # Simulate frame extraction completion
-    context.driver.execute_script("""
-        window.updateExperimentState({
-            extractedFrames: Array.from({length: 9}, (_, i) => ({
-                url: 'test-frame-' + i,
-                timestamp: (i + 1) * 5,
-                filename: 'frame_' + (i + 1) + '.png'
-            })),
-            operationsRemaining: 1
-        });
-    """)
+    set_state(
+        extractedFrames=[
+            {'url': f'test-frame-{i}', 'timestamp': (i + 1) * 5, 'filename': f'frame_{i + 1}.png'}
+            for i in range(9)
+        ],
+        operationsRemaining=1
+    )
 
 @then('the Pitch Analysis section does not appear yet')
 def pitch_analysis_not_appear():
     # Verify section doesn't exist
-    pitch_sections = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid="pitch-analysis-section"]')
-    assert len(pitch_sections) == 0, "Pitch Analysis section appeared prematurely"
+    assert count_elements('[data-testid="pitch-analysis-section"]') == 0, "Pitch Analysis section appeared prematurely"
 
 @then('the system waits for transcription completion')
 def system_waits_transcription():
-    # Verify we're still in processing state
-    processing_text = wait_for_element('[data-testid="current-step-text"]')
-    assert "operation" in processing_text.text.lower() and "remaining" in processing_text.text.lower()
+    # Verify we're still in processing state, as rendered in the status text
+    # (e.g. "Processing video... (1 operation remaining)")
+    wait_for_text('[data-testid="current-step-text"]', "operation", "remaining")
 
 @when('only transcription is complete (frames still processing)')
 def only_transcription_complete():
-    context.driver.execute_script("""
-        window.updateExperimentState({
-            fullTranscript: 'This is a test transcript for the pitch.',
-            segmentedTranscript: [
-                {text: 'This is a test', startTime: 0, endTime: 5, confidence: 0.95},
-                {text: 'transcript for the pitch', startTime: 5, endTime: 10, confidence: 0.93}
-            ],
-            operationsRemaining: 1
-        });
-    """)
+    set_state(
+        fullTranscript='This is a test transcript for the pitch.',
+        segmentedTranscript=[
+            {'text': 'This is a test', 'startTime': 0, 'endTime': 5, 'confidence': 0.95},
+            {'text': 'transcript for the pitch', 'startTime': 5, 'endTime': 10, 'confidence': 0.93}
+        ],
+        operationsRemaining=1
+    )
 
 @then('the system waits for frame extraction completion')
 def system_waits_frames():
     # Verify section still doesn't appear
-    pitch_sections = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid="pitch-analysis-section"]')
-    assert len(pitch_sections) == 0, "Pitch Analysis section appeared before frames completed"
+    assert count_elements('[data-testid="pitch-analysis-section"]') == 0, "Pitch Analysis section appeared before frames completed"
 
 @when('both frame extraction AND segmented transcription are complete')
 def both_processing_complete():
-    context.driver.execute_script("""
-        window.updateExperimentState({
-            processingStep: 'complete',
-            operationsRemaining: 0,
-            parallelOperationsActive: false
-        });
-    """)
+    set_state(processingStep='complete', operationsRemaining=0, parallelOperationsActive=False)
 
 @then('the Pitch Analysis section appears within 500ms automatically')
 def pitch_section_appears_quickly():
     # Measure timing of section appearance
-    start_time = time.time()
-    pitch_section = wait_for_element('[data-testid="pitch-analysis-section"]', timeout=1)
-    elapsed_time = time.time() - start_time
+    # The wait itself is the deadline
+    start_time = time.perf_counter()
+    pitch_section = wait_for_element('[data-testid="pitch-analysis-section"]', timeout=0.6)
+    elapsed_time = time.perf_counter() - start_time
     
     assert elapsed_time <= 0.6, f"Section took {elapsed_time:.3f}s to appear, expected <= 0.5s"
     assert pitch_section.is_displayed()
@@ -711,44 +813,42 @@ def either_process_fails():
 
 @then('the Pitch Analysis section never appears')
 def pitch_section_never_appears():
-    # Wait reasonable time to ensure section doesn't appear
-    time.sleep(2)
-    pitch_sections = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid="pitch-analysis-section"]')
-    assert len(pitch_sections) == 0, "Pitch Analysis section should not appear when processing fails"
+    # Watch for a reasonable time to ensure section doesn't appear, failing
+    # as soon as it does
+    try:
+        wait_until(lambda d: count_elements('[data-testid="pitch-analysis-section"]'), timeout=2)
+    except TimeoutException:
+        return
+    assert False, "Pitch Analysis section should not appear when processing fails"
 
 @then('the user is not presented with a broken analysis experience')
 def no_broken_analysis_experience():
     # Verify no partial analysis UI elements
-    analysis_elements = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid^="analysis-"]')
-    visible_analysis_elements = [el for el in analysis_elements if el.is_displayed()]
-    assert len(visible_analysis_elements) == 0, "Found analysis UI elements when processing failed"
+    # (visibility is checked in the browser for all matches at once)
+    visible_analysis_elements = context.driver.execute_script(_IS_DISPLAYED_JS + """
+        return Array.from(document.querySelectorAll('[data-testid^="analysis-"]'))
+            .filter(isDisplayed)
+            .map(el => el.getAttribute('data-testid'));
+    """)
+    assert len(visible_analysis_elements) == 0, f"Found analysis UI elements when processing failed: {visible_analysis_elements}"
 
 
 # Scenario 7: Multimodal Data Processing Validation
 @given('the system has extracted 9 frames at 5-second intervals (0:05, 0:10, 0:15, etc.)')
 def system_has_extracted_frames():
     # Verify frames are available with correct timestamps
-    context.driver.execute_script("""
-        const frames = Array.from({length: 9}, (_, i) => ({
-            url: 'frame-' + (i + 1),
-            timestamp: (i + 1) * 5,
-            filename: 'frame_' + String(i + 1).padStart(2, '0') + 'm' + String((i + 1) * 5).padStart(2, '0') + 's.png'
-        }));
-        window.updateExperimentState({ extractedFrames: frames });
-    """)
+    set_state(extractedFrames=[
+        {'url': f'frame-{i + 1}', 'timestamp': (i + 1) * 5, 'filename': f'frame_{i + 1:02d}m{(i + 1) * 5:02d}s.png'}
+        for i in range(9)
+    ])
 
 @given('the system has segmented transcript in 5-second chunks')
 def system_has_segmented_transcript():
     # Create transcript segments aligned with frame timestamps
-    context.driver.execute_script("""
-        const segments = Array.from({length: 9}, (_, i) => ({
-            text: 'Segment ' + (i + 1) + ' text content',
-            startTime: i * 5,
-            endTime: (i + 1) * 5,
-            confidence: 0.9 + (Math.random() * 0.1)
-        }));
-        window.updateExperimentState({ segmentedTranscript: segments });
-    """)
+    set_state(segmentedTranscript=[
+        {'text': f'Segment {i + 1} text content', 'startTime': i * 5, 'endTime': (i + 1) * 5, 'confidence': 0.95}
+        for i in range(9)
+    ])
 
 @given('the automatic analysis is preparing to send data to Claude 4 Opus')
 def analysis_preparing_data():
@@ -758,8 +858,13 @@ def analysis_preparing_data():
 
 @when('the system aligns frames with transcript segments')
 def system_aligns_data():
-    # This happens automatically in the system
-    time.sleep(0.5)
+    # This happens automatically in the system; alignment is done once the
+    # analysis moves past its preparing stage (or reports an error)
+    wait_until(lambda d: d.execute_script("""
+        const state = window.experimentState;
+        return !!state && (state.pitchAnalysisError ||
+            (state.pitchAnalysisStage && state.pitchAnalysisStage !== 'preparing'));
+    """), timeout=5)
 
 @then('frame at 0:05 is paired with transcript segment 0:00-0:05')
 def frame_paired_with_segment_1():
@@ -783,14 +888,7 @@ def pattern_continues_all_frames():
 @when('the aligned data is sent to the Anthropic API')
 def aligned_data_sent_to_api():
     # Verify API call phase
-    def check_api_phase():
-        try:
-            progress_text = context.driver.find_element(By.CSS_SELECTOR, '[data-testid="analysis-progress-text"]')
-            return "Claude 4 Opus" in progress_text.text
-        except:
-            return False
-    
-    WebDriverWait(context.driver, 10).until(lambda d: check_api_phase())
+    wait_for_text('[data-testid="analysis-progress-text"]', "Claude 4 Opus")
 
 @then('the payload includes both visual and textual information for each time segment')
 def payload_includes_multimodal_data():
@@ -822,14 +920,13 @@ def analysis_identifies_mismatch():
 
 @then('the result specifies the exact timestamp where the mismatch occurs')
 def result_specifies_timestamp():
-    issues = wait_for_elements('[data-testid^="issue-item-"]')
+    issues = fetch_issues()
     found_timestamp = False
     
     for issue in issues:
-        if "mismatch" in issue.text.lower():
-            timestamp_elements = issue.find_elements(By.CSS_SELECTOR, '[data-testid^="issue-timestamp-"]')
-            if len(timestamp_elements) > 0:
-                timestamp_text = timestamp_elements[0].text
+        if "mismatch" in issue['text'].lower():
+            if issue['timestamp'] is not None:
+                timestamp_text = issue['timestamp']
                 # Verify timestamp format (e.g., "at 2:15")
                 assert ":" in timestamp_text, f"Invalid timestamp format: {timestamp_text}"
                 found_timestamp = True
@@ -839,19 +936,19 @@ def result_specifies_timestamp():
 
 @then('the result describes both what was said and what was shown visually')
 def result_describes_both_modalities():
-    issues = wait_for_elements('[data-testid^="issue-item-"]')
-    found_multimodal_description = False
-    
-    for issue in issues:
-        issue_text = issue.text.lower()
-        if "mismatch" in issue_text:
-            # Look for descriptions of both verbal and visual content
-            has_verbal = any(word in issue_text for word in ["says", "speaker", "verbal", "spoken"])
-            has_visual = any(word in issue_text for word in ["slide", "shows", "visual", "displays"])
-            
-            if has_verbal and has_visual:
-                found_multimodal_description = True
-                break
+    wait_for_elements('[data-testid^="issue-item-"]')
+    
+    # Look for a mismatch describing both verbal and visual content, checking
+    # the keywords in the browser and returning only the verdict
+    found_multimodal_description = context.driver.execute_script("""
+        const [verbalWords, visualWords] = arguments;
+        return Array.from(document.querySelectorAll('[data-testid^="issue-item-"]')).some(issue => {
+            const text = issue.innerText.toLowerCase();
+            return text.includes('mismatch') &&
+                verbalWords.some(word => text.includes(word)) &&
+                visualWords.some(word => text.includes(word));
+        });
+    """, ["says", "speaker", "verbal", "spoken"], ["slide", "shows", "visual", "displays"])
     
     assert found_multimodal_description, "Issue description doesn't include both verbal and visual information"
 
@@ -859,11 +956,11 @@ def result_describes_both_modalities():
 def demonstrates_multimodal_value():
     # The presence of visual-verbal mismatch detection proves multimodal value
     # Verify that the analysis found issues that require both modalities to detect
-    issues = wait_for_elements('[data-testid^="issue-item-"]')
+    issues = fetch_issues()
     multimodal_issues = []
     
     for issue in issues:
-        issue_text = issue.text.lower()
+        issue_text = issue['text'].lower()
         if any(term in issue_text for term in ["mismatch", "alignment", "visual-verbal", "slide"]):
             multimodal_issues.append(issue)
     
@@ -4,24 +4,74 @@ Step Definitions for Task 14: Status Communication Migration
 Complete UI implementation testing with visual verification, interactions, and accessibility.
 """
 
+import os
+import re
 import time
 import json
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from behave import given, when, then
 import requests
 from unittest.mock import patch, MagicMock
 
+# Fake "errors" the old transcription flow logged while waiting for audio,
+# one pattern per step so each keeps its own phrase list
+_FAKE_ERROR_RE = re.compile(r'Large file detected|wait for frame extraction|Error: Large file')
+_SEVERE_FAKE_ERROR_RE = re.compile(r'Large file detected|wait for frame extraction')
+_LARGE_FILE_ERROR_RE = re.compile(r'Error: Large file detected|please wait for frame extraction')
+
+# Parts of the "🎵 Audio extraction in progress" banner, matched in one pass
+_BANNER_RE = re.compile(r'(?P<icon>🎵|♪)|(?P<audio>audio)|(?P<progress>extraction|progress)', re.IGNORECASE)
+
+# Any of the words that make the banner text a wait-time estimate
+_TIME_ESTIMATE_RE = re.compile(r'second|minute|wait|estimated|~|approximately', re.IGNORECASE)
+
+# Upload fixtures, resolved once per session (override with TEST_FIXTURES_DIR)
+_FIXTURES_DIR = Path(os.environ.get('TEST_FIXTURES_DIR') or Path(__file__).resolve().parent / 'fixtures')
+
+# WebDriverWait instances keyed by (driver, timeout, poll frequency)
+_WAIT_CACHE = {}
+
+# In-page equivalent of WebElement.is_displayed(): laid out, not hidden via
+# visibility, and neither the element nor an ancestor fully transparent
+_IS_DISPLAYED_JS = """
+    const isDisplayed = el => {
+        if (el.getClientRects().length === 0) return false;
+        if (['hidden', 'collapse'].includes(window.getComputedStyle(el).visibility)) return false;
+        for (let node = el; node; node = node.parentElement) {
+            if (window.getComputedStyle(node).opacity === '0') return false;
+        }
+        return true;
+    };
+"""
+
 # Test utilities for complete UI verification
+def get_wait(timeout=10, poll=0.2):
+    """Return a shared WebDriverWait for this driver and timeout"""
+    key = (context.driver, timeout, poll)
+    if key not in _WAIT_CACHE:
+        _WAIT_CACHE[key] = WebDriverWait(
+            context.driver, timeout, poll_frequency=poll,
+            ignored_exceptions=(StaleElementReferenceException,)
+        )
+    return _WAIT_CACHE[key]
+
 def wait_for_element(selector, timeout=10):
     """Wait for element to be present and visible"""
-    driver = context.driver
-    return WebDriverWait(driver, timeout).until(
+    # Usually an earlier step already rendered it: take it in one round trip
+    element = context.driver.execute_script(_IS_DISPLAYED_JS + """
+        const el = document.querySelector(arguments[0]);
+        return el && isDisplayed(el) ? el : null;
+    """, selector)
+    if element is not None:
+        return element
+    return get_wait(timeout).until(
         EC.visibility_of_element_located((By.CSS_SELECTOR, selector))
     )
 
@@ -29,32 +79,176 @@ def find_element(selector):
     """Find element by CSS selector"""
     return context.driver.find_element(By.CSS_SELECTOR, selector)
 
-def get_computed_style(element):
-    """Get computed CSS styles for element"""
-    return context.driver.execute_script(
-        "return window.getComputedStyle(arguments[0]);", element
-    )
+def upload_fixture(file_name):
+    """Select a fixture file in the page's file input"""
+    find_element('input[type="file"]').send_keys(str(_FIXTURES_DIR / file_name))
+
+def get_computed_style(element, properties):
+    """Get the named computed CSS properties for element"""
+    return context.driver.execute_script("""
+        const styles = window.getComputedStyle(arguments[0]);
+        return Object.fromEntries(arguments[1].map(name => [name, styles.getPropertyValue(name)]));
+    """, element, properties)
+
+def collect_network_events():
+    """Drain new performance log entries into the scenario's API response events"""
+    events = getattr(context, 'network_events', None)
+    if events is None:
+        events = context.network_events = []
+    
+    # get_log() only returns entries since the last call, so keep what we've
+    # seen; skip the JSON parse for anything that isn't an API response
+    for log in context.driver.get_log('performance'):
+        raw_message = log['message']
+        if '"Network.responseReceived"' not in raw_message or '/api/' not in raw_message:
+            continue
+        response = json.loads(raw_message)['message']['params']['response']
+        events.append({'url': response['url'], 'status': response['status']})
+    return events
+
+def collect_browser_logs(*levels):
+    """Drain new console entries into the scenario's log buffer and return those at the given levels (default all)"""
+    logs_by_level = getattr(context, 'browser_logs', None)
+    if logs_by_level is None:
+        logs_by_level = context.browser_logs = {}
+    
+    # get_log() drains the browser's buffer, so keep entries for later steps
+    for log in context.driver.get_log('browser'):
+        logs_by_level.setdefault(log['level'], []).append(log)
+    return [log for level in (levels or logs_by_level) for log in logs_by_level.get(level, [])]
+
+def status_info_logs():
+    """INFO-level console entries that mention the processing status"""
+    info_logs = collect_browser_logs('INFO', 'LOG')
+    return [log for log in info_logs if 'status' in log['message'].lower() or 'waiting' in log['message'].lower()]
+
+def transcription_statuses():
+    """HTTP status codes of the transcription API responses seen so far"""
+    return [event['status'] for event in collect_network_events() if '/api/experiment/transcribe' in event['url']]
 
 def wait_for_api_call(url_pattern, timeout=10):
     """Wait for specific API call to complete"""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        logs = context.driver.get_log('performance')
-        for log in logs:
-            message = json.loads(log['message'])
-            if url_pattern in str(message):
-                return message
-        time.sleep(0.1)
-    raise TimeoutException(f"API call {url_pattern} not found within {timeout}s")
-
-def check_accessibility_attributes(element):
-    """Verify accessibility attributes are present"""
-    return {
-        'aria_label': element.get_attribute('aria-label'),
-        'role': element.get_attribute('role'),
-        'aria_live': element.get_attribute('aria-live'),
-        'tabindex': element.get_attribute('tabindex')
-    }
+    def find_call(driver):
+        return next((event for event in collect_network_events() if url_pattern in event['url']), None)
+    
+    return get_wait(timeout).until(
+        find_call, f"API call {url_pattern} not found within {timeout}s"
+    )
+
+def ensure_script_timeout(seconds):
+    """Set the async script timeout, skipping the round trip when it's unchanged"""
+    if getattr(context, 'script_timeout', None) != seconds:
+        context.driver.set_script_timeout(seconds)
+        context.script_timeout = seconds
+
+def wait_for_text_in_page(selector, fragments, any_of=False, ignore_case=False, timeout=10):
+    """Wait for an element's text to contain the fragments, polling inside the browser in one call"""
+    ensure_script_timeout(timeout + 1)
+    if not context.driver.execute_async_script("""
+        const [selector, fragments, anyOf, ignoreCase, timeout, done] = arguments;
+        const deadline = Date.now() + timeout * 1000;
+        (function poll() {
+            const el = document.querySelector(selector);
+            const text = el ? (ignoreCase ? el.innerText.toLowerCase() : el.innerText) : '';
+            const found = fragments.map(fragment => text.includes(fragment));
+            if (el && (anyOf ? found.some(Boolean) : found.every(Boolean))) return done(true);
+            if (Date.now() > deadline) return done(false);
+            setTimeout(poll, 50);
+        })();
+    """, selector, list(fragments), any_of, ignore_case, timeout):
+        raise TimeoutException(f"Text {fragments} not found in {selector} within {timeout}s")
+
+def wait_for_waiting_banner(timeout=10):
+    """Wait for the waiting banner and remember it for the rest of the scenario"""
+    context.waiting_banner = wait_for_element('[data-testid="waiting-banner"]', timeout=timeout)
+    return context.waiting_banner
+
+def get_waiting_banner():
+    """Return the waiting banner, reusing the element found earlier in the scenario"""
+    if getattr(context, 'waiting_banner', None) is None:
+        context.waiting_banner = find_element('[data-testid="waiting-banner"]')
+    return context.waiting_banner
+
+def read_waiting_banner(read):
+    """Apply read to the remembered waiting banner, finding it again once if it was re-rendered"""
+    try:
+        return read(get_waiting_banner())
+    except StaleElementReferenceException:
+        context.waiting_banner = None
+        return read(get_waiting_banner())
+
+def snapshot_banner(selector='[data-testid="waiting-banner"]'):
+    """Read a banner's styles, size, ARIA attributes and text in one round trip"""
+    snapshot = context.driver.execute_script(_IS_DISPLAYED_JS + """
+        const el = document.querySelector(arguments[0]);
+        if (!el) return null;
+        const styles = window.getComputedStyle(el);
+        const rect = el.getBoundingClientRect();
+        return {
+            background_color: styles.backgroundColor,
+            border_color: styles.borderColor,
+            opacity: styles.opacity,
+            width: rect.width,
+            height: rect.height,
+            aria_live: el.getAttribute('aria-live'),
+            aria_label: el.getAttribute('aria-label'),
+            role: el.getAttribute('role'),
+            class_name: el.className,
+            text: el.innerText.trim(),
+            visible: isDisplayed(el)
+        };
+    """, selector)
+    assert snapshot is not None, f"{selector} not found"
+    return snapshot
+
+def banner_aria_snapshot():
+    """Snapshot of the waiting banner for the accessibility steps, read once per scenario"""
+    # Later ARIA attribute changes are still caught through window.__ariaLog
+    if getattr(context, 'banner_aria', None) is None:
+        context.banner_aria = snapshot_banner()
+    return context.banner_aria
+
+def inspect_components(selectors):
+    """Check presence, visibility, content and classes of several components in one round trip"""
+    return context.driver.execute_script(_IS_DISPLAYED_JS + """
+        return arguments[0].map(selector => {
+            const el = document.querySelector(selector);
+            if (!el) return {selector, present: false};
+            return {
+                selector,
+                present: true,
+                visible: isDisplayed(el),
+                has_content: el.childElementCount > 0 || el.innerText.length > 0,
+                class_name: el.getAttribute('class') || ''
+            };
+        });
+    """, selectors)
+
+def start_aria_log():
+    """Record every aria-live, aria-label and role change in the page, so transient values aren't missed"""
+    context.driver.execute_script("""
+        if (window.__ariaObserver) return;
+        window.__ariaLog = [];
+        window.__ariaObserver = new MutationObserver(mutations => mutations.forEach(m => window.__ariaLog.push({
+            target: m.target.getAttribute('data-testid'),
+            attr: m.attributeName,
+            value: m.target.getAttribute(m.attributeName),
+            t: performance.now()
+        })));
+        window.__ariaObserver.observe(document.body, {
+            subtree: true, attributes: true, attributeFilter: ['aria-live', 'aria-label', 'role']
+        });
+    """)
+
+def open_experiment_page():
+    """Load the architecture experiment page fresh for this scenario"""
+    # A reload also stops the previous scenario's timers, intervals and fetches
+    context.driver.get("http://localhost:3000/experiment/architecture-test")
+    
+    # Start the scenario with no API responses from earlier ones
+    collect_network_events()
+    context.network_events = []
+    start_aria_log()
 
 # ============================================================================
 # SCENARIO 1: Video Upload with Audio Ready Immediately
@@ -63,14 +257,14 @@ def check_accessibility_attributes(element):
 @given('the transcription API is migrated to status-based communication')
 def transcription_api_migrated():
     """Verify the API migration is complete by checking response format"""
-    context.driver.get("http://localhost:3000/experiment/architecture-test")
+    open_experiment_page()
     
     # Wait for page to load completely
-    wait_for_element('.upload-dropzone', timeout=15)
+    dropzone = wait_for_element('.upload-dropzone', timeout=15)
     
     # Verify page title and components are loaded
     assert "Architecture Experiment" in context.driver.title
-    assert find_element('.upload-dropzone').is_displayed()
+    assert dropzone.is_displayed()
     assert find_element('[data-testid="processing-status"]').is_displayed()
 
 @given('a video is uploaded that has fast Mux audio extraction')
@@ -81,14 +275,24 @@ def upload_fast_audio_video():
     context.expected_audio_ready = True
     
     # Create a test file input and upload
-    file_input = find_element('input[type="file"]')
-    file_input.send_keys(f"/Users/jaredpace/code/pitch-perfect/tests/fixtures/{context.test_video_file}")
+    upload_fixture(context.test_video_file)
     
-    # Wait for upload to complete
+    # Wait for upload to complete, reacting to DOM changes in the page rather
+    # than polling the progress text
     upload_progress = wait_for_element('.upload-progress', timeout=10)
-    WebDriverWait(context.driver, 15).until(
-        lambda driver: "100%" in upload_progress.text or not upload_progress.is_displayed()
-    )
+    ensure_script_timeout(16)
+    upload_finished = context.driver.execute_async_script(_IS_DISPLAYED_JS + """
+        const [target, done] = arguments;
+        const finished = () => !target.isConnected || !isDisplayed(target) ||
+            target.innerText.includes('100%');
+        if (finished()) return done(true);
+        const observer = new MutationObserver(() => {
+            if (finished()) { observer.disconnect(); done(true); }
+        });
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+        setTimeout(() => { observer.disconnect(); done(false); }, 15000);
+    """, upload_progress)
+    assert upload_finished, "Upload did not complete within 15s"
 
 @when('transcription is attempted and Mux audio is already available')
 def transcription_attempted_audio_ready():
@@ -105,17 +309,12 @@ def transcription_attempted_audio_ready():
 def api_returns_200_success():
     """Verify API returns success response for ready audio"""
     # Check network logs for transcription API call
-    logs = context.driver.get_log('performance')
-    transcription_call_found = False
-    
-    for log in logs:
-        message = json.loads(log['message'])
-        if '/api/experiment/transcribe' in str(message):
-            transcription_call_found = True
-            # In real implementation, would check response status
-            break
+    transcription_calls = [
+        event for event in collect_network_events() if '/api/experiment/transcribe' in event['url']
+    ]
     
-    assert transcription_call_found, "Transcription API call not found"
+    assert transcription_calls, "Transcription API call not found"
+    assert transcription_calls[0]['status'] == 200, f"Expected HTTP 200, got {transcription_calls[0]['status']}"
 
 @then('no status communication responses are triggered')
 def no_status_communication():
@@ -125,25 +324,20 @@ def no_status_communication():
     assert len(waiting_banners) == 0, "Unexpected waiting banner appeared"
     
     # Verify no 202 status responses in logs
-    logs = context.driver.get_log('performance')
-    for log in logs:
-        message = json.loads(log['message'])
-        if '202' in str(message) and 'transcribe' in str(message):
-            assert False, "Unexpected 202 status response found"
+    for event in collect_network_events():
+        assert not (event['status'] == 202 and 'transcribe' in event['url']), "Unexpected 202 status response found"
 
 @then('the processing flow shows "✅ Transcription: Complete"')
 def processing_shows_complete():
     """Verify processing status displays completion"""
-    status_section = wait_for_element('[data-testid="processing-status"]', timeout=15)
+    wait_for_element('[data-testid="processing-status"]', timeout=15)
     
     # Wait for completion indicator
-    WebDriverWait(context.driver, 20).until(
-        lambda driver: "✅" in status_section.text and "Complete" in status_section.text
-    )
+    wait_for_text_in_page('[data-testid="processing-status"]', ["✅", "Complete"], timeout=20)
     
     # Verify visual styling of completion
     completion_element = find_element('[data-testid="transcription-status"]')
-    styles = get_computed_style(completion_element)
+    styles = get_computed_style(completion_element, ['color'])
     assert 'green' in styles['color'].lower() or 'rgb(34, 197, 94)' in styles['color']
 
 @then('no waiting states appear in the UI')
@@ -157,10 +351,13 @@ def no_waiting_states():
         '.dependency-wait'
     ]
     
-    for selector in waiting_elements:
-        elements = context.driver.find_elements(By.CSS_SELECTOR, selector)
-        for element in elements:
-            assert not element.is_displayed(), f"Unexpected waiting element {selector} is visible"
+    # One joined query, with visibility checked in the browser
+    visible = context.driver.execute_script(_IS_DISPLAYED_JS + """
+        return Array.from(document.querySelectorAll(arguments[0]))
+            .filter(isDisplayed)
+            .map(element => element.getAttribute('data-testid') || element.className);
+    """, ', '.join(waiting_elements))
+    assert not visible, f"Unexpected waiting elements are visible: {visible}"
 
 # ============================================================================
 # SCENARIO 2: Video Upload with Audio Extraction in Progress - Status Response
@@ -173,8 +370,7 @@ def upload_delayed_audio_video():
     context.expected_audio_delay = True
     
     # Upload video file
-    file_input = find_element('input[type="file"]')
-    file_input.send_keys(f"/Users/jaredpace/code/pitch-perfect/tests/fixtures/{context.test_video_file}")
+    upload_fixture(context.test_video_file)
     
     # Wait for upload completion
     wait_for_element('.upload-complete', timeout=15)
@@ -195,24 +391,19 @@ def api_returns_202_not_500():
     wait_for_api_call('/api/experiment/transcribe', timeout=15)
     
     # Check browser network logs for 202 response
-    logs = context.driver.execute_script("""
-        return performance.getEntriesByType('resource')
-            .filter(entry => entry.name.includes('/api/experiment/transcribe'))
-            .map(entry => ({name: entry.name, status: entry.responseStatus}));
-    """)
+    statuses = transcription_statuses()
+    assert len(statuses) > 0, "No transcription API calls found"
+    assert 202 in statuses, f"Expected HTTP 202, got {statuses}"
+    assert 500 not in statuses, f"Unexpected HTTP 500 in {statuses}"
     
-    transcribe_calls = [log for log in logs if 'transcribe' in log['name']]
-    assert len(transcribe_calls) > 0, "No transcription API calls found"
-    
-    # In real implementation, would verify 202 status
-    # For now, verify that waiting UI appears (indicating 202 response)
-    wait_for_element('[data-testid="waiting-banner"]', timeout=10)
+    # Verify that waiting UI appears for the 202 response
+    wait_for_waiting_banner(timeout=10)
 
 @then('the response body contains structured status data')
 def response_contains_structured_data():
     """Verify structured JSON status response"""
     # Check that waiting banner displays structured information
-    waiting_banner = wait_for_element('[data-testid="waiting-banner"]', timeout=10)
+    waiting_banner = wait_for_waiting_banner(timeout=10)
     
     # Verify banner contains key status information
     banner_text = waiting_banner.text
@@ -220,7 +411,7 @@ def response_contains_structured_data():
     assert "estimated" in banner_text.lower() or "wait" in banner_text.lower()
     
     # Verify banner styling indicates info (not error)
-    styles = get_computed_style(waiting_banner)
+    styles = get_computed_style(waiting_banner, ['background-color'])
     background_color = styles['background-color']
     # Should be blue/info color, not red/error color
     assert 'blue' in background_color.lower() or 'rgb(59, 130, 246)' in background_color
@@ -229,8 +420,7 @@ def response_contains_structured_data():
 def no_error_object_thrown():
     """Verify no error appears in browser console"""
     # Check browser console for errors
-    console_logs = context.driver.get_log('browser')
-    error_logs = [log for log in console_logs if log['level'] == 'SEVERE']
+    error_logs = collect_browser_logs('SEVERE')
     
     # Filter out unrelated errors, look for transcription errors
     transcription_errors = [
@@ -244,17 +434,11 @@ def no_error_object_thrown():
 def no_fake_error_stack_traces():
     """Verify clean server logs without fake errors"""
     # Check browser console for stack traces
-    console_logs = context.driver.get_log('browser')
-    
-    fake_error_patterns = [
-        "Large file detected",
-        "wait for frame extraction",
-        "Error: Large file"
-    ]
+    console_logs = collect_browser_logs()
     
     for log in console_logs:
-        for pattern in fake_error_patterns:
-            assert pattern not in log['message'], f"Found fake error pattern: {pattern}"
+        match = _FAKE_ERROR_RE.search(log['message'])
+        assert not match, f"Found fake error pattern: {match and match.group()}"
 
 # ============================================================================
 # SCENARIO 3: Frontend Status Detection - No Error Message Parsing
@@ -264,7 +448,7 @@ def no_fake_error_stack_traces():
 def frontend_migrated_status_detection():
     """Verify frontend uses status detection instead of error parsing"""
     # Navigate to the page and verify components are loaded
-    context.driver.get("http://localhost:3000/experiment/architecture-test")
+    open_experiment_page()
     wait_for_element('.upload-dropzone', timeout=10)
 
 @given('the transcription API returns HTTP 202 with waiting status')
@@ -281,8 +465,7 @@ def api_returns_202_waiting():
 def frontend_processes_response():
     """Upload video and trigger API response processing"""
     # Upload a video that will trigger waiting status
-    file_input = find_element('input[type="file"]')
-    file_input.send_keys("/Users/jaredpace/code/pitch-perfect/tests/fixtures/test-video.mp4")
+    upload_fixture("test-video.mp4")
     
     # Wait for upload and initial processing
     wait_for_element('.upload-complete', timeout=15)
@@ -291,20 +474,18 @@ def frontend_processes_response():
 def detects_202_status_not_parsing():
     """Verify status code detection instead of message parsing"""
     # Wait for waiting banner to appear
-    waiting_banner = wait_for_element('[data-testid="waiting-banner"]', timeout=15)
+    wait_for_waiting_banner(timeout=15)
     
     # Verify banner appears without error styling
-    styles = get_computed_style(waiting_banner)
-    assert 'red' not in styles['background-color'] and 'error' not in styles['class']
+    banner = snapshot_banner()
+    assert 'red' not in banner['background_color'] and 'error' not in banner['class_name']
 
 @then('it extracts the status field: "waiting_for_dependency"')
 def extracts_status_field():
     """Verify status field extraction"""
     # Check that waiting banner displays status-based content
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    
     # Should contain status-based messaging
-    banner_text = waiting_banner.text.lower()
+    banner_text = read_waiting_banner(lambda banner: banner.text).lower()
     status_indicators = ["waiting", "progress", "extraction", "dependency"]
     assert any(indicator in banner_text for indicator in status_indicators)
 
@@ -332,19 +513,18 @@ def does_not_add_error():
 def calls_check_processing_completion():
     """Verify retry logic is set up"""
     # Should see processing indicators that show retry logic is active
-    processing_section = find_element('[data-testid="processing-status"]')
+    def retry_indicated(driver):
+        # Look the section up on every poll so a re-render can't leave a stale reference
+        status_text = find_element('[data-testid="processing-status"]').text.lower()
+        return "retry" in status_text or "checking" in status_text or "waiting" in status_text
     
     # Look for retry-related indicators
-    WebDriverWait(context.driver, 10).until(
-        lambda driver: "retry" in processing_section.text.lower() or 
-                      "checking" in processing_section.text.lower() or
-                      "waiting" in processing_section.text.lower()
-    )
+    get_wait(10).until(retry_indicated)
 
 @then('the UI shows "🎵 Audio extraction in progress" (not error banner)')
 def ui_shows_audio_extraction_progress():
     """Verify UI shows progress message instead of error"""
-    waiting_banner = wait_for_element('[data-testid="waiting-banner"]', timeout=10)
+    waiting_banner = wait_for_waiting_banner(timeout=10)
     
     # Verify content
     banner_text = waiting_banner.text
@@ -352,7 +532,7 @@ def ui_shows_audio_extraction_progress():
     assert "extraction" in banner_text.lower() or "progress" in banner_text.lower()
     
     # Verify styling is info/progress, not error
-    styles = get_computed_style(waiting_banner)
+    styles = get_computed_style(waiting_banner, ['background-color'])
     background_color = styles['background-color']
     
     # Should be blue/info color (not red/error)
@@ -369,21 +549,19 @@ def ui_shows_audio_extraction_progress():
 @given('the retry logic is migrated to status-based detection')
 def retry_logic_migrated():
     """Set up migrated retry logic scenario"""
-    context.driver.get("http://localhost:3000/experiment/architecture-test")
+    open_experiment_page()
     wait_for_element('.upload-dropzone', timeout=10)
 
 @given('`transcriptionStage` is set to `\'waiting_for_dependency\'`')
 def transcription_stage_waiting():
     """Set up waiting dependency state"""
     # Upload video that triggers waiting state
-    file_input = find_element('input[type="file"]')
-    file_input.send_keys("/Users/jaredpace/code/pitch-perfect/tests/fixtures/test-video.mp4")
+    upload_fixture("test-video.mp4")
     
     # Wait for waiting state to appear
-    wait_for_element('[data-testid="waiting-banner"]', timeout=15)
+    waiting_banner = wait_for_waiting_banner(timeout=15)
     
     # Verify waiting state is active
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
     assert waiting_banner.is_displayed()
 
 @given('frame extraction has completed providing muxPlaybackId')
@@ -391,13 +569,24 @@ def frame_extraction_completed():
     """Simulate frame extraction completion"""
     # Wait for frame extraction to complete
     # This would be indicated by frames appearing or completion status
-    try:
-        # Wait for frames to appear or completion indicator
-        WebDriverWait(context.driver, 30).until(
-            lambda driver: len(driver.find_elements(By.CSS_SELECTOR, '.frame-thumbnail')) > 0 or
-                          "frames complete" in driver.find_element(By.CSS_SELECTOR, '[data-testid="processing-status"]').text.lower()
-        )
-    except TimeoutException:
+    # Wait for frames to appear or completion indicator, checking on each DOM
+    # change inside the browser
+    ensure_script_timeout(31)
+    frames_ready = context.driver.execute_async_script("""
+        const done = arguments[arguments.length - 1];
+        const check = () => {
+            if (document.querySelector('.frame-thumbnail')) return true;
+            const status = document.querySelector('[data-testid="processing-status"]');
+            return !!status && status.innerText.toLowerCase().includes('frames complete');
+        };
+        if (check()) return done(true);
+        const observer = new MutationObserver(() => {
+            if (check()) { observer.disconnect(); done(true); }
+        });
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+        setTimeout(() => { observer.disconnect(); done(false); }, 30000);
+    """)
+    if not frames_ready:
         # If frames don't appear, at least verify processing is progressing
         processing_status = find_element('[data-testid="processing-status"]')
         assert processing_status.is_displayed()
@@ -410,9 +599,8 @@ def retry_condition_check_runs():
     context.retry_check_time = time.time()
     
     # Wait for either retry to occur or completion
-    WebDriverWait(context.driver, 20).until(
-        lambda driver: "retry" in driver.find_element(By.CSS_SELECTOR, '[data-testid="processing-status"]').text.lower() or
-                      "complete" in driver.find_element(By.CSS_SELECTOR, '[data-testid="processing-status"]').text.lower()
+    wait_for_text_in_page(
+        '[data-testid="processing-status"]', ["retry", "complete"], any_of=True, ignore_case=True, timeout=20
     )
 
 @then('it evaluates `prev.transcriptionStage === \'waiting_for_dependency\'`')
@@ -429,36 +617,30 @@ def evaluates_transcription_stage():
 @then('it does NOT use `.includes(\'Large file detected\')` parsing')
 def does_not_use_includes_parsing():
     """Verify no error message parsing occurs"""
-    # Check that no "Large file detected" errors appear anywhere
-    all_text_elements = context.driver.find_elements(By.CSS_SELECTOR, '*')
-    
-    for element in all_text_elements:
-        try:
-            element_text = element.text
-            assert "Large file detected" not in element_text, f"Found error message parsing: {element_text}"
-        except:
-            continue  # Skip elements that can't be read
+    # Check that no "Large file detected" errors appear anywhere, searching
+    # the page's rendered text once in the browser
+    forbidden_messages = ["Large file detected"]
+    found = context.driver.execute_script("""
+        const pageText = document.body.innerText;
+        return arguments[0].filter(message => pageText.includes(message));
+    """, forbidden_messages)
+    assert not found, f"Found error message parsing: {found}"
 
 @then('it clears the waiting status: `transcriptionStage: undefined`')
 def clears_waiting_status():
     """Verify waiting status is cleared"""
-    # Wait for waiting banner to disappear
-    WebDriverWait(context.driver, 15).until(
-        EC.invisibility_of_element_located((By.CSS_SELECTOR, '[data-testid="waiting-banner"]'))
+    # Wait for waiting banner to disappear (the wait already confirms that no
+    # matching banner is still visible)
+    get_wait(15).until(
+        EC.invisibility_of_element_located((By.CSS_SELECTOR, '[data-testid="waiting-banner"]')),
+        "Waiting banner should be cleared"
     )
-    
-    # Verify waiting banner is no longer visible
-    waiting_banners = context.driver.find_elements(By.CSS_SELECTOR, '[data-testid="waiting-banner"]')
-    for banner in waiting_banners:
-        assert not banner.is_displayed(), "Waiting banner should be cleared"
 
 @then('the automatic retry is triggered with `handleTranscription()`')
 def automatic_retry_triggered():
     """Verify automatic retry is triggered"""
     # Should see transcription progress or completion
-    WebDriverWait(context.driver, 15).until(
-        lambda driver: "transcrib" in driver.find_element(By.CSS_SELECTOR, '[data-testid="processing-status"]').text.lower()
-    )
+    wait_for_text_in_page('[data-testid="processing-status"]', ["transcrib"], ignore_case=True, timeout=15)
     
     # Verify transcription section shows activity
     transcript_section = wait_for_element('[data-testid="transcript-section"]', timeout=10)
@@ -469,7 +651,7 @@ def retry_uses_mux_playback_id():
     """Verify retry uses available Mux playback ID"""
     # Should see successful transcription processing
     # Wait for transcript content to appear
-    WebDriverWait(context.driver, 20).until(
+    get_wait(20).until(
         lambda driver: len(driver.find_elements(By.CSS_SELECTOR, '.transcript-segment')) > 0 or
                       "transcript" in driver.find_element(By.CSS_SELECTOR, '[data-testid="transcript-section"]').text.lower()
     )
@@ -481,11 +663,12 @@ def retry_uses_mux_playback_id():
 @given('the status communication migration is complete')
 def status_communication_migration_complete():
     """Set up completed migration scenario"""
-    context.driver.get("http://localhost:3000/experiment/architecture-test")
+    open_experiment_page()
     wait_for_element('.upload-dropzone', timeout=10)
     
     # Clear any existing logs
-    context.driver.get_log('browser')
+    collect_browser_logs()
+    context.browser_logs = {}
 
 @when('monitoring application logs during video processing with audio extraction delay')
 def monitoring_logs_during_processing():
@@ -494,60 +677,49 @@ def monitoring_logs_during_processing():
     context.log_start_time = time.time()
     
     # Upload video that will trigger audio extraction delay
-    file_input = find_element('input[type="file"]')
-    file_input.send_keys("/Users/jaredpace/code/pitch-perfect/tests/fixtures/test-video.mp4")
+    upload_fixture("test-video.mp4")
     
-    # Wait for processing to begin
-    wait_for_element('.upload-complete', timeout=15)
+    # No wait here: the log and API steps below wait for exactly the entries
+    # they assert on, which are buffered as they arrive
 
 @then('server logs show INFO level: "Status: waiting_for_dependency"')
 def server_logs_show_info_status():
     """Verify clean INFO level logging"""
     # Check browser console logs
-    logs = context.driver.get_log('browser')
-    
     # Look for info-level status messages
-    info_logs = [log for log in logs if log['level'] in ['INFO', 'LOG']]
-    status_logs = [log for log in info_logs if 'status' in log['message'].lower() or 'waiting' in log['message'].lower()]
-    
-    assert len(status_logs) > 0, "Should find status-related INFO logs"
+    get_wait(15).until(
+        lambda driver: status_info_logs(), "Should find status-related INFO logs within 15s"
+    )
 
 @then('API response logs show "HTTP 202 - Audio extraction in progress"')
 def api_logs_show_202_response():
     """Verify 202 response logging"""
     # Check for network logs indicating 202 response
-    network_logs = context.driver.execute_script("""
-        return performance.getEntriesByType('resource')
-            .filter(entry => entry.name.includes('/api/experiment/transcribe'));
-    """)
-    
-    assert len(network_logs) > 0, "Should find transcription API calls"
+    get_wait(15).until(
+        lambda driver: 202 in transcription_statuses(),
+        "Should find a 202 transcription response within 15s"
+    )
 
 @then('no fake error stack traces appear in server logs')
 def no_fake_error_stack_traces_in_logs():
     """Verify no fake error stack traces"""
-    logs = context.driver.get_log('browser')
-    error_logs = [log for log in logs if log['level'] == 'SEVERE']
-    
-    fake_error_patterns = ["Large file detected", "wait for frame extraction"]
+    error_logs = collect_browser_logs('SEVERE')
     
     for log in error_logs:
-        for pattern in fake_error_patterns:
-            assert pattern not in log['message'], f"Found fake error: {log['message']}"
+        assert not _SEVERE_FAKE_ERROR_RE.search(log['message']), f"Found fake error: {log['message']}"
 
 @then('no "Error: Large file detected..." messages in logs')
 def no_large_file_error_messages():
     """Verify specific fake error messages are absent"""
-    logs = context.driver.get_log('browser')
+    logs = collect_browser_logs()
     
     for log in logs:
-        assert "Error: Large file detected" not in log['message']
-        assert "please wait for frame extraction" not in log['message']
+        assert not _LARGE_FILE_ERROR_RE.search(log['message']), f"Found fake error: {log['message']}"
 
 @then('browser console shows structured JSON status response')
 def browser_console_shows_structured_json():
     """Verify structured JSON in console"""
-    logs = context.driver.get_log('browser')
+    logs = collect_browser_logs()
     
     # Look for structured status logs
     status_logs = [log for log in logs if 'status' in log['message'] and 'waiting_for_dependency' in log['message']]
@@ -559,17 +731,11 @@ def browser_console_shows_structured_json():
 def network_shows_202_not_500():
     """Verify network response codes"""
     # Check network entries for transcription API
-    network_entries = context.driver.execute_script("""
-        return performance.getEntriesByType('resource')
-            .filter(entry => entry.name.includes('/api/experiment/transcribe'))
-            .map(entry => ({
-                name: entry.name,
-                transferSize: entry.transferSize,
-                duration: entry.duration
-            }));
-    """)
+    statuses = transcription_statuses()
     
-    assert len(network_entries) > 0, "Should find transcription API network entries"
+    assert len(statuses) > 0, "Should find transcription API network entries"
+    assert 202 in statuses, f"Should find a 202 transcription response, got {statuses}"
+    assert 500 not in statuses, f"Should not find a 500 transcription response, got {statuses}"
 
 # ============================================================================
 # UI Visual Verification and Accessibility Tests
@@ -578,11 +744,11 @@ def network_shows_202_not_500():
 @then('the UI shows blue info banner (not red error banner)')
 def ui_shows_blue_info_banner():
     """Verify banner color and styling"""
-    waiting_banner = wait_for_element('[data-testid="waiting-banner"]', timeout=10)
+    wait_for_waiting_banner(timeout=10)
     
     # Check computed styles
-    styles = get_computed_style(waiting_banner)
-    background_color = styles['background-color']
+    banner = snapshot_banner()
+    background_color = banner['background_color']
     
     # Verify blue/info styling
     blue_patterns = ['blue', 'rgb(59, 130, 246)', 'rgb(37, 99, 235)']
@@ -591,43 +757,50 @@ def ui_shows_blue_info_banner():
     is_blue = any(pattern in background_color for pattern in blue_patterns)
     is_red = any(pattern in background_color for pattern in red_patterns)
     
-    assert is_blue or 'blue' in styles['border-color'], f"Expected blue styling, got background: {background_color}"
+    assert is_blue or 'blue' in banner['border_color'], f"Expected blue styling, got background: {background_color}"
     assert not is_red, f"Should not have red/error styling, got: {background_color}"
 
 @then('the banner displays "🎵 Audio extraction in progress"')
 def banner_displays_audio_extraction():
     """Verify banner content"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    banner_text = waiting_banner.text
+    banner_text = read_waiting_banner(lambda banner: banner.text)
     
-    assert "🎵" in banner_text or "♪" in banner_text, "Should contain audio icon"
-    assert "audio" in banner_text.lower(), "Should mention audio"
-    assert "extraction" in banner_text.lower() or "progress" in banner_text.lower(), "Should indicate progress"
+    matches = {match.lastgroup for match in _BANNER_RE.finditer(banner_text)}
+    
+    assert 'icon' in matches, "Should contain audio icon"
+    assert 'audio' in matches, "Should mention audio"
+    assert 'progress' in matches, "Should indicate progress"
 
 @then('the banner shows estimated wait time from API response')
 def banner_shows_estimated_wait_time():
     """Verify wait time display"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    banner_text = waiting_banner.text
+    banner_text = read_waiting_banner(lambda banner: banner.text)
     
     # Should contain time indicators
-    time_indicators = ["second", "minute", "wait", "estimated", "~", "approximately"]
-    assert any(indicator in banner_text.lower() for indicator in time_indicators), f"Should show time estimate in: {banner_text}"
+    assert _TIME_ESTIMATE_RE.search(banner_text), f"Should show time estimate in: {banner_text}"
 
 @then('the banner fades out smoothly after transcription starts')
 def banner_fades_out_smoothly():
     """Verify smooth fade-out animation"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    
     # Wait for transcription to start (banner should fade out)
     start_time = time.time()
-    initial_opacity = get_computed_style(waiting_banner)['opacity']
     
-    # Wait for fade-out to begin
-    WebDriverWait(context.driver, 20).until(
-        lambda driver: float(get_computed_style(waiting_banner)['opacity']) < float(initial_opacity) or
-                      not waiting_banner.is_displayed()
-    )
+    # Wait for fade-out to begin, polling the banner's opacity in the browser
+    ensure_script_timeout(21)
+    faded = context.driver.execute_async_script(_IS_DISPLAYED_JS + """
+        const done = arguments[arguments.length - 1];
+        const opacityOf = el => parseFloat(getComputedStyle(el).opacity);
+        const banner = () => document.querySelector('[data-testid="waiting-banner"]');
+        const initial = banner() ? opacityOf(banner()) : 0;
+        const deadline = Date.now() + 20000;
+        (function poll() {
+            const el = banner();
+            if (!el || !isDisplayed(el) || opacityOf(el) < initial) return done(true);
+            if (Date.now() > deadline) return done(false);
+            setTimeout(poll, 100);
+        })();
+    """)
+    assert faded, "Banner did not start fading out within 20s"
     
     fade_duration = time.time() - start_time
     assert fade_duration < 5.0, f"Fade out took too long: {fade_duration}s"
@@ -639,8 +812,7 @@ def banner_fades_out_smoothly():
 @then('the waiting banner has proper ARIA labels')
 def waiting_banner_has_aria_labels():
     """Verify accessibility attributes"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    accessibility_attrs = check_accessibility_attributes(waiting_banner)
+    accessibility_attrs = banner_aria_snapshot()
     
     # Should have proper ARIA attributes
     assert accessibility_attrs['aria_live'] in ['polite', 'assertive'], "Should have aria-live for screen readers"
@@ -649,28 +821,36 @@ def waiting_banner_has_aria_labels():
 @then('keyboard navigation works during waiting state')
 def keyboard_navigation_works():
     """Verify keyboard accessibility during waiting"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    
-    # Test tab navigation
+    # Test tab navigation (a real key press; synthetic KeyboardEvents don't move focus)
     action_chains = ActionChains(context.driver)
     action_chains.send_keys(Keys.TAB).perform()
     
     # Should be able to navigate to interactive elements
-    focused_element = context.driver.switch_to.active_element
-    assert focused_element is not None, "Should maintain keyboard focus"
+    focused = context.driver.execute_script("""
+        const el = document.activeElement;
+        return el && (el.getAttribute('data-testid') || el.tagName);
+    """)
+    assert focused not in (None, 'BODY'), f"Tab should move focus to an interactive element, got {focused}"
 
 @then('screen reader announcements work correctly')
 def screen_reader_announcements_work():
     """Verify screen reader compatibility"""
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
+    accessibility_attrs = banner_aria_snapshot()
     
     # Check for live region
-    aria_live = waiting_banner.get_attribute('aria-live')
+    aria_live = accessibility_attrs['aria_live']
     assert aria_live in ['polite', 'assertive'], "Should have aria-live for screen reader announcements"
     
     # Check for descriptive text
-    aria_label = waiting_banner.get_attribute('aria-label') or waiting_banner.text
+    aria_label = accessibility_attrs['aria_label'] or accessibility_attrs['text']
     assert len(aria_label) > 0, "Should have descriptive text for screen readers"
+    
+    # The live region must not have been switched off at any point, or
+    # updates made meanwhile were never announced
+    aria_changes = context.driver.execute_script("return window.__ariaLog || []")
+    for change in aria_changes:
+        if change['target'] == 'waiting-banner' and change['attr'] == 'aria-live':
+            assert change['value'] in ['polite', 'assertive'], f"aria-live changed to {change['value']!r} during the scenario"
 
 # ============================================================================
 # Integration and Performance Testing
@@ -682,16 +862,21 @@ def retry_timing_matches_pre_migration():
     # Measure retry timing
     retry_start_time = time.time()
     
-    # Wait for retry to occur (indicated by transcription progress)
-    WebDriverWait(context.driver, 30).until(
-        lambda driver: "transcrib" in driver.find_element(By.CSS_SELECTOR, '[data-testid="processing-status"]').text.lower() or
-                      len(driver.find_elements(By.CSS_SELECTOR, '.transcript-segment')) > 0
+    # Wait for retry to occur (indicated by transcription progress), checking
+    # both signals in one call per poll
+    get_wait(10).until(
+        lambda driver: driver.execute_script("""
+            const status = document.querySelector('[data-testid="processing-status"]');
+            return (!!status && status.innerText.toLowerCase().includes('transcrib')) ||
+                document.querySelector('.transcript-segment') !== null;
+        """),
+        "Retry took too long: no transcription activity within 10s"
     )
     
     retry_duration = time.time() - retry_start_time
     
-    # Should complete within reasonable time (adjust based on expected behavior)
-    assert retry_duration < 30, f"Retry took too long: {retry_duration}s"
+    # Should complete within reasonable time (10s is the UX ceiling)
+    assert retry_duration < 10, f"Retry took too long: {retry_duration}s"
     assert retry_duration > 1, f"Retry too fast, might not be working correctly: {retry_duration}s"
 
 @then('all ShadCN components render correctly')
@@ -704,17 +889,14 @@ def shadcn_components_render():
         '[data-testid="progress-bar"]'  # Progress component
     ]
     
-    for component_selector in shadcn_components:
-        try:
-            component = find_element(component_selector)
-            assert component.is_displayed(), f"ShadCN component {component_selector} should be visible"
-            
-            # Verify styling is applied
-            styles = get_computed_style(component)
-            assert len(styles['class']) > 0, f"Component {component_selector} should have CSS classes"
-        except:
-            # Some components might not be present in all scenarios
-            pass
+    for component in inspect_components(shadcn_components):
+        # Some components might not be present in all scenarios
+        if not component['present']:
+            continue
+        assert component['visible'], f"ShadCN component {component['selector']} should be visible"
+        
+        # Verify styling is applied
+        assert len(component['class_name']) > 0, f"Component {component['selector']} should have CSS classes"
 
 @then('component integration works seamlessly')
 def component_integration_works():
@@ -727,13 +909,12 @@ def component_integration_works():
         '[data-testid="processing-status"]'
     ]
     
-    for section in major_sections:
-        section_element = find_element(section)
-        assert section_element.is_displayed(), f"Section {section} should be visible"
+    for section in inspect_components(major_sections):
+        assert section['present'], f"Section {section['selector']} should be present"
+        assert section['visible'], f"Section {section['selector']} should be visible"
         
         # Verify section has content or proper loading states
-        section_text = section_element.text
-        assert len(section_text) > 0 or len(section_element.find_elements(By.CSS_SELECTOR, '*')) > 0, f"Section {section} should have content"
+        assert section['has_content'], f"Section {section['selector']} should have content"
 
 # ============================================================================
 # Cross-Platform and Mobile Testing
@@ -742,36 +923,37 @@ def component_integration_works():
 @then('mobile responsive behavior works correctly')
 def mobile_responsive_works():
     """Test mobile responsiveness"""
-    # Change viewport to mobile size
-    context.driver.set_window_size(375, 667)  # iPhone size
-    
-    # Wait for responsive layout to apply
-    time.sleep(1)
-    
-    # Verify elements are still accessible
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    assert waiting_banner.is_displayed(), "Waiting banner should be visible on mobile"
-    
-    # Check that text is readable (not cut off)
-    styles = get_computed_style(waiting_banner)
-    assert float(styles['width'].replace('px', '')) > 200, "Banner should have reasonable width on mobile"
+    # Emulate a mobile viewport in the renderer (iPhone size); the layout is
+    # applied by the time the command returns, without resizing the window
+    context.driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+        'width': 375, 'height': 667, 'deviceScaleFactor': 2, 'mobile': True
+    })
     
-    # Reset viewport
-    context.driver.set_window_size(1280, 720)
+    try:
+        # Verify elements are still accessible
+        banner = snapshot_banner()
+        assert banner['visible'], "Waiting banner should be visible on mobile"
+        
+        # Check that text is readable (not cut off)
+        assert banner['width'] > 200, "Banner should have reasonable width on mobile"
+    finally:
+        # Reset viewport
+        context.driver.execute_cdp_cmd('Emulation.clearDeviceMetricsOverride', {})
 
 @then('touch interactions work on mobile devices')
 def touch_interactions_work():
     """Test touch-friendly interactions"""
     # Simulate touch events on interactive elements
-    waiting_banner = find_element('[data-testid="waiting-banner"]')
-    
     # Verify banner is large enough for touch
-    banner_rect = waiting_banner.rect
+    banner_rect = read_waiting_banner(lambda banner: banner.rect)
     assert banner_rect['height'] >= 44, "Banner should be touch-friendly height (44px minimum)"
     
     # Test touch event (simulate with click)
-    ActionChains(context.driver).click(waiting_banner).perform()
+    read_waiting_banner(lambda banner: ActionChains(context.driver).click(banner).perform())
     
-    # Should not cause errors or unexpected behavior
-    time.sleep(0.5)
-    assert waiting_banner.is_displayed(), "Banner should remain stable after touch interaction"
\ No newline at end of file
+    # Should not cause errors or unexpected behavior once the page has
+    # handled the click and repainted
+    context.driver.execute_async_script(
+        "const done = arguments[0]; requestAnimationFrame(() => requestAnimationFrame(done));"
+    )
+    assert read_waiting_banner(lambda banner: banner.is_displayed()), "Banner should remain stable after touch interaction"
\ No newline at end of file